@@ -1,17 +1,74 @@
-import axios from "axios";
-import { ChatMessage, ChatCompletion, ModelData } from "../types/index.js";
+import axios, { AxiosInstance } from "axios";
+import { Agent as HttpAgent } from "http";
+import { Agent as HttpsAgent } from "https";
+import { ChatMessage, ChatCompletion, ModelData, ModelsIndex } from "../types/index.js";
 
 // API Constants
 const ENDPOINT = "https://models.inference.ai.azure.com";
 const TOKEN = process.env.GITHUB_TOKEN || "";
 const CACHE_TTL = 600; // 10 minutes in seconds
 
+// Shared HTTP client, created lazily on first use
+let httpClient: AxiosInstance | null = null;
+
 // Cache state
 let modelsCache: ModelData[] | null = null;
 let modelsCacheTimestamp = 0;
+let modelsIndex: ModelsIndex | null = null;
+
+// Last ETag seen from the catalog, for conditional refreshes
+let catalogEtag: string | null = null;
+
+/**
+ * Get the shared HTTP client, creating it on first use.
+ * Keep-alive agents let repeated requests reuse warm TCP+TLS
+ * connections instead of opening a new one per call.
+ */
+function getHttpClient(): AxiosInstance {
+  if (httpClient === null) {
+    httpClient = axios.create({
+      httpAgent: new HttpAgent({ keepAlive: true, maxSockets: 32, maxFreeSockets: 16 }),
+      httpsAgent: new HttpsAgent({ keepAlive: true, maxSockets: 32, maxFreeSockets: 16, timeout: 60000 })
+    });
+  }
+  return httpClient;
+}
+
+// Retry settings for the catalog fetch
+const MAX_FETCH_RETRIES = 3;
+const RETRY_BACKOFF_MS = 200;
+
+/**
+ * POST through the shared client, retrying transient failures
+ * (network errors, 429, 5xx) with exponential backoff.
+ */
+async function postWithRetry(url: string, body: any, headers: Record<string, string>) {
+  for (let attempt = 0; ; attempt++) {
+    try {
+      return await getHttpClient().post(url, body, {
+        headers,
+        responseType: "json",
+        // Accept 304 Not Modified alongside success for conditional requests
+        validateStatus: status => (status >= 200 && status < 300) || status === 304
+      });
+    } catch (error) {
+      const status = axios.isAxiosError(error) ? error.response?.status : undefined;
+      const retriable = status === undefined || status === 429 || status >= 500;
+      if (!retriable || attempt >= MAX_FETCH_RETRIES) {
+        throw error;
+      }
+      await new Promise(resolve => setTimeout(resolve, RETRY_BACKOFF_MS * 2 ** attempt));
+    }
+  }
+}
 
 /**
  * Send a request to the GitHub Models API
+ *
+ * The chat completions endpoint accepts a single model per request and
+ * offers no server-side batching, so multi-model comparisons issue one
+ * request per model; the shared keep-alive pool lets those concurrent
+ * requests reuse warm connections instead of handshaking per call.
  */
 export async function callGitHubModelsAPI(
   model: string, 
@@ -25,7 +82,7 @@ export async function callGitHubModelsAPI(
   }
 
   try {
-    const response = await axios.post(
+    const response = await getHttpClient().post(
       `${ENDPOINT}/v1/chat/completions`,
       {
         model,
@@ -59,7 +116,10 @@ export async function callGitHubModelsAPI(
 export async function fetchAvailableModels(): Promise<ModelData[]> {
   try {
     const url = "https://api.catalog.azureml.ms/asset-gallery/v1.0/models";
-    const headers = { "Content-Type": "application/json" };
+    const headers: Record<string, string> = { "Content-Type": "application/json" };
+    if (catalogEtag !== null && modelsCache !== null) {
+      headers["If-None-Match"] = catalogEtag;
+    }
     const body = {
       filters: [
         { field: "freePlayground", values: ["true"], operator: "eq" },
@@ -68,11 +128,21 @@ export async function fetchAvailableModels(): Promise<ModelData[]> {
       order: [{ field: "displayName", direction: "Asc" }]
     };
 
-    const response = await axios.post(url, body, { headers });
+    const response = await postWithRetry(url, body, headers);
+
+    // Catalog unchanged since the last fetch: skip the download and
+    // re-parse entirely and keep serving the current models
+    if (response.status === 304 && modelsCache !== null) {
+      return modelsCache;
+    }
+
     if (!response.data) {
       throw new Error(`Failed to fetch models: ${response.status}`);
     }
 
+    const etag = response.headers?.["etag"];
+    catalogEtag = typeof etag === "string" ? etag : null;
+
     const apiResponse = response.data;
     const modelsData: ModelData[] = [];
     
@@ -97,6 +167,10 @@ export async function fetchAvailableModels(): Promise<ModelData[]> {
     
     return modelsData;
   } catch (error) {
+    // Forget the ETag: the cache is about to hold fallback data, and a
+    // conditional refresh answered with 304 would keep returning that
+    // fallback even after the real catalog is reachable again
+    catalogEtag = null;
     // Silently fall back to default models without logging
     return getFallbackModels();
   }
@@ -106,6 +180,8 @@ export async function fetchAvailableModels(): Promise<ModelData[]> {
  * Get fallback models when API fails
  */
 function getFallbackModels(): ModelData[] {
+  // Sorted by displayName on the way out so fallback data honors the
+  // same ordering contract as the catalog response
   return [
     { id: "gpt-4o", displayName: "GPT-4o", publisher: "OpenAI", summary: "OpenAI's most advanced multimodal model", context_window: 128000 },
     { id: "gpt-4o-mini", displayName: "GPT-4o-mini", publisher: "OpenAI", summary: "Smaller, efficient version of GPT-4o", context_window: 128000 },
@@ -115,20 +191,110 @@ function getFallbackModels(): ModelData[] {
     { id: "Meta-Llama-3-8B-Instruct", displayName: "Meta Llama 3 8B Instruct", publisher: "Meta", summary: "Balanced performance and efficiency", context_window: 8192 },
     { id: "Mistral-large", displayName: "Mistral Large", publisher: "Mistral AI", summary: "Mistral's flagship model for complex reasoning", context_window: 32768 },
     { id: "Mistral-small", displayName: "Mistral Small", publisher: "Mistral AI", summary: "Efficient model for low-latency use cases", context_window: 32768 }
-  ];
+  ].sort((a, b) => a.displayName.localeCompare(b.displayName));
+}
+
+// In-flight cache refresh, shared so expiry triggers only one fetch
+let refreshPromise: Promise<ModelData[]> | null = null;
+
+/**
+ * Fetch the catalog and update the cache state
+ */
+async function refreshModels(): Promise<ModelData[]> {
+  const models = await fetchAvailableModels();
+  modelsCache = models;
+  modelsCacheTimestamp = monotonicSeconds();
+  return models;
 }
 
 /**
- * Get model data with caching
+ * Monotonic clock in seconds for TTL arithmetic; unlike Date.now()
+ * it cannot jump backwards or forwards with wall-clock adjustments
+ */
+function monotonicSeconds(): number {
+  return performance.now() / 1000;
+}
+
+/**
+ * Get model data with caching (stale-while-revalidate)
  */
 export async function getModelsData(): Promise<ModelData[]> {
-  const currentTime = Date.now() / 1000;
-  
-  if (modelsCache !== null && (currentTime - modelsCacheTimestamp) < CACHE_TTL) {
+  const currentTime = monotonicSeconds();
+
+  if (modelsCache !== null) {
+    // Serve the cached list immediately; when the TTL has lapsed,
+    // refresh in the background so the request that happens to hit
+    // expiry doesn't pay for the full catalog round-trip
+    if ((currentTime - modelsCacheTimestamp) >= CACHE_TTL && refreshPromise === null) {
+      refreshPromise = refreshModels().finally(() => {
+        refreshPromise = null;
+      });
+    }
     return modelsCache;
   }
-  
-  modelsCache = await fetchAvailableModels();
-  modelsCacheTimestamp = currentTime;
-  return modelsCache;
+
+  // Cold cache: nothing to serve yet, so block on the fetch, but
+  // coalesce concurrent callers onto a single in-flight request
+  // instead of each one hitting the catalog independently
+  if (refreshPromise === null) {
+    refreshPromise = refreshModels().finally(() => {
+      refreshPromise = null;
+    });
+  }
+  return refreshPromise;
+}
+
+/**
+ * Build the derived lookup structures for a model list
+ */
+function buildModelsIndex(models: ModelData[]): ModelsIndex {
+  const byId = new Map<string, ModelData>();
+  const byPublisher = new Map<string, ModelData[]>();
+  const byPublisherLower = new Map<string, ModelData[]>();
+
+  for (const model of models) {
+    byId.set(model.id, model);
+    const publisher = model.publisher || "Unknown";
+    const group = byPublisher.get(publisher);
+    if (group) {
+      group.push(model);
+    } else {
+      byPublisher.set(publisher, [model]);
+    }
+
+    // Grouped independently under the lower-cased key so publisher
+    // filters stay case-insensitive: publishers differing only in
+    // case share one filter group instead of shadowing each other
+    const lowerKey = publisher.toLowerCase();
+    const lowerGroup = byPublisherLower.get(lowerKey);
+    if (lowerGroup) {
+      lowerGroup.push(model);
+    } else {
+      byPublisherLower.set(lowerKey, [model]);
+    }
+  }
+
+  return {
+    models,
+    byId,
+    byPublisher,
+    byPublisherLower,
+    publishers: [...byPublisher.keys()].sort()
+  };
+}
+
+/**
+ * Get the model data plus precomputed indexes (id map, publisher
+ * groups). The index is rebuilt only when the cache refreshes, so
+ * lookups that would otherwise rescan the model list per request
+ * become O(1).
+ */
+export async function getModelsIndex(): Promise<ModelsIndex> {
+  const models = await getModelsData();
+
+  if (modelsIndex === null || modelsIndex.models !== models) {
+    modelsIndex = buildModelsIndex(models);
+  }
+
+  return modelsIndex;
 } 
\ No newline at end of file
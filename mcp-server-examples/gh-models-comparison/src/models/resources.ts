@@ -1,5 +1,5 @@
 import { McpServer, ResourceTemplate } from "@modelcontextprotocol/sdk/server/mcp.js";
-import { getModelsData } from "../api/github-models.js";
+import { getModelsIndex } from "../api/github-models.js";
 
 export function registerResources(server: McpServer) {
   /**
@@ -10,54 +10,32 @@ export function registerResources(server: McpServer) {
     new ResourceTemplate("models://available", { list: undefined }),
     { description: "List available models from GitHub Models" },
     async (uri, params) => {
-      const models = await getModelsData();
-      
-      // Format the models data into a readable string
-      const formattedModels = ["# Available Models", ""];
-      
-      // Group models by publisher
-      const publishers: Record<string, any[]> = {};
-      
-      for (const model of models) {
-        const modelId = model.id || "unknown";
-        const displayName = model.displayName || modelId;
-        const publisher = model.publisher || "Unknown";
-        const contextWindow = model.context_window || 0;
-        const summary = model.summary || "";
-        
-        if (!publishers[publisher]) {
-          publishers[publisher] = [];
-        }
-        
-        publishers[publisher].push({
-          id: modelId,
-          display_name: displayName,
-          context_window: contextWindow,
-          summary: summary
-        });
-      }
-      
-      // Sort publishers alphabetically
-      for (const publisher of Object.keys(publishers).sort()) {
-        formattedModels.push(`## ${publisher}`);
-        formattedModels.push("");
-        
-        // Sort models by display name within each publisher
-        for (const model of publishers[publisher].sort((a, b) => 
-            a.display_name.localeCompare(b.display_name))) {
-          const contextStr = model.context_window ? 
-            ` - ${model.context_window.toLocaleString()} tokens` : "";
-          const summaryStr = model.summary ? ` - ${model.summary}` : "";
-          formattedModels.push(`- **${model.display_name}** (\`${model.id}\`)${contextStr}${summaryStr}`);
-        }
-        
-        formattedModels.push("");
-      }
-      
+      const index = await getModelsIndex();
+
+      // Format the document in one pass from the precomputed publisher
+      // groups; publishers are pre-sorted, and the groups preserve
+      // display-name order because both the catalog response and the
+      // fallback list are sorted by displayName before grouping
+      const lines = [
+        "# Available Models",
+        "",
+        ...index.publishers.flatMap(publisher => [
+          `## ${publisher}`,
+          "",
+          ...(index.byPublisher.get(publisher) || []).map(model => {
+            const contextStr = model.context_window ?
+              ` - ${model.context_window.toLocaleString()} tokens` : "";
+            const summaryStr = model.summary ? ` - ${model.summary}` : "";
+            return `- **${model.displayName || model.id || "unknown"}** (\`${model.id || "unknown"}\`)${contextStr}${summaryStr}`;
+          }),
+          ""
+        ])
+      ];
+
       return {
         contents: [{
           uri: uri.href,
-          text: formattedModels.join("\n")
+          text: lines.join("\n")
         }]
       };
     }
@@ -1,6 +1,99 @@
 import { z } from "zod";
+import { writeFile } from "fs/promises";
 import { McpServer } from "@modelcontextprotocol/sdk/server/mcp.js";
-import { getModelsData, callGitHubModelsAPI } from "../api/github-models.js";
+import { getModelsIndex, callGitHubModelsAPI } from "../api/github-models.js";
+
+const DEFAULT_MODELS = ["gpt-4o", "Mistral-small", "Phi-3-mini-128k-instruct"];
+
+/**
+ * Resolve the requested model list against the cached catalog,
+ * keeping only models that actually exist (O(1) per model via the index)
+ */
+async function validateModels(models: string[] | undefined): Promise<string[]> {
+  const modelList = models || DEFAULT_MODELS;
+  const index = await getModelsIndex();
+  return modelList.filter((modelName: string) => index.byId.has(modelName));
+}
+
+/**
+ * Build the "no valid models" error payload
+ */
+async function noValidModelsError(): Promise<Record<string, any>> {
+  const index = await getModelsIndex();
+  return {
+    error: "No valid models specified",
+    available_models: index.models.map(model => model.id)
+  };
+}
+
+/**
+ * Run a single prompt against the requested models.
+ * Validates the model list, then fans the completions out concurrently.
+ */
+async function runComparison(
+  prompt: string,
+  systemMessage: string,
+  models: string[] | undefined,
+  temperature: number,
+  topP: number,
+  maxTokens: number
+): Promise<Record<string, any>> {
+  const validModels = await validateModels(models);
+
+  if (validModels.length === 0) {
+    return noValidModelsError();
+  }
+
+  return runValidatedComparison(prompt, systemMessage, validModels, temperature, topP, maxTokens);
+}
+
+/**
+ * Fan a prompt out to an already-validated model list concurrently
+ */
+async function runValidatedComparison(
+  prompt: string,
+  systemMessage: string,
+  validModels: string[],
+  temperature: number,
+  topP: number,
+  maxTokens: number
+): Promise<Record<string, any>> {
+  // Query all models concurrently so total latency is the slowest
+  // model rather than the sum of all model latencies
+  const results: Record<string, any> = {};
+
+  await Promise.all(validModels.map(async (modelName: string) => {
+    try {
+      const response = await callGitHubModelsAPI(
+        modelName,
+        [
+          { role: "system", content: systemMessage },
+          { role: "user", content: prompt }
+        ],
+        temperature,
+        topP,
+        maxTokens
+      );
+
+      results[modelName] = {
+        content: response.choices[0].message.content,
+        finish_reason: response.choices[0].finish_reason,
+        usage: response.usage
+      };
+    } catch (error) {
+      results[modelName] = { error: String(error) };
+    }
+  }));
+
+  return {
+    results,
+    summary: {
+      models_compared: validModels,
+      prompt,
+      system_message: systemMessage
+    }
+  };
+}
 
 export function registerTools(server: McpServer) {
   /**
@@ -15,30 +108,36 @@ export function registerTools(server: McpServer) {
       sort_by: z.string().default("displayName").describe("Sort models by this field (options: 'displayName', 'publisher', 'popularity', 'context_window')")
     },
     async ({ include_metadata, filter_publisher, sort_by }) => {
-      const models = await getModelsData();
-      
-      // Apply publisher filter if specified
+      const index = await getModelsIndex();
+      const models = index.models;
+
+      // Apply publisher filter if specified (O(1) via the lowercased
+      // publisher groups built at cache refresh)
       let filteredModels = models;
       if (filter_publisher) {
-        filteredModels = models.filter(model => 
-          model.publisher.toLowerCase() === filter_publisher.toLowerCase());
+        filteredModels = index.byPublisherLower.get(filter_publisher.toLowerCase()) || [];
       }
       
       // Apply sorting
       const validSortFields = ["displayName", "publisher", "popularity", "context_window", "id"];
       const sortField = validSortFields.includes(sort_by) ? sort_by : "displayName";
       
-      // Sort the models
-      const sortedModels = [...filteredModels].sort((a, b) => {
-        const valueA = a[sortField as keyof typeof a] || (typeof a[sortField as keyof typeof a] === 'string' ? "" : 0);
-        const valueB = b[sortField as keyof typeof b] || (typeof b[sortField as keyof typeof b] === 'string' ? "" : 0);
-        
-        if (typeof valueA === 'string' && typeof valueB === 'string') {
-          return valueA.localeCompare(valueB);
-        }
-        
-        return (valueA as number) - (valueB as number);
-      });
+      // The catalog is fetched ordered by displayName ascending, and
+      // the fallback list is sorted the same way on construction, so
+      // the default sort can reuse the cached order instead of
+      // re-sorting on every request
+      const sortedModels = sortField === "displayName"
+        ? filteredModels
+        : [...filteredModels].sort((a, b) => {
+          const valueA = a[sortField as keyof typeof a] || (typeof a[sortField as keyof typeof a] === 'string' ? "" : 0);
+          const valueB = b[sortField as keyof typeof b] || (typeof b[sortField as keyof typeof b] === 'string' ? "" : 0);
+
+          if (typeof valueA === 'string' && typeof valueB === 'string') {
+            return valueA.localeCompare(valueB);
+          }
+
+          return (valueA as number) - (valueB as number);
+        });
       
       if (include_metadata) {
         return {
@@ -47,7 +146,7 @@ export function registerTools(server: McpServer) {
             text: JSON.stringify({
               models: sortedModels,
               count: sortedModels.length,
-              publishers: [...new Set(models.map(model => model.publisher || "Unknown"))].sort(),
+              publishers: index.publishers,
               applied_filters: {
                 publisher: filter_publisher,
                 sort_by: sortField
@@ -79,10 +178,10 @@ export function registerTools(server: McpServer) {
       model_id: z.string().describe("The ID of the model to get details for")
     },
     async ({ model_id }) => {
-      const models = await getModelsData();
-      
-      const model = models.find(m => m.id === model_id);
-      
+      const index = await getModelsIndex();
+
+      const model = index.byId.get(model_id);
+
       if (model) {
         return {
           content: [{
@@ -101,7 +200,7 @@ export function registerTools(server: McpServer) {
           text: JSON.stringify({
             error: `Model with ID '${model_id}' not found`,
             found: false,
-            available_models: models.map(m => m.id)
+            available_models: index.models.map(m => m.id)
           }, null, 2)
         }]
       };
@@ -123,67 +222,70 @@ export function registerTools(server: McpServer) {
       max_tokens: z.number().default(1000).describe("Maximum tokens to generate")
     },
     async ({ prompt, system_message, models, temperature, top_p, max_tokens }, extra) => {
-      const defaultModels = ["gpt-4o", "Mistral-small", "Phi-3-mini-128k-instruct"];
-      const modelList = models || defaultModels;
-      
-      // Validate that the requested models exist
-      const availableModels = await getModelsData();
-      const availableModelIds = availableModels.map(model => model.id);
-      
-      // Filter out invalid models and warn about them
-      const validModels = modelList.filter((modelName: string) => {
-        const isValid = availableModelIds.includes(modelName);
-        return isValid;
-      });
-      
+      const comparison = await runComparison(
+        prompt, system_message, models, temperature, top_p, max_tokens);
+
+      return {
+        content: [{
+          type: "text",
+          text: JSON.stringify(comparison, null, 2)
+        }]
+      };
+    }
+  );
+
+  /**
+   * MCP Tool to compare models across multiple prompts in one call
+   */
+  server.tool(
+    "batch_compare",
+    "Compare responses from different GitHub models across multiple prompts",
+    {
+      prompts: z.array(z.string()).describe("The user messages to send to all models"),
+      system_message: z.string().default("You are a helpful assistant.").describe("The system message to use"),
+      models: z.array(z.string()).optional().describe("List of model names to compare (defaults to ['gpt-4o', 'Mistral-small', 'Phi-3-mini-128k-instruct'])"),
+      temperature: z.number().describe("Temperature parameter for generation (0.0 to 2.0)").default(1.0),
+      top_p: z.number().describe("Top-p parameter for generation (0.0 to 1.0)").default(1.0),
+      max_tokens: z.number().default(1000).describe("Maximum tokens to generate"),
+      concurrency: z.number().default(4).describe("Maximum number of prompts processed at once")
+    },
+    async ({ prompts, system_message, models, temperature, top_p, max_tokens, concurrency }) => {
+      // Validate the model list once for the whole batch instead of
+      // re-checking it for every prompt
+      const validModels = await validateModels(models);
+
       if (validModels.length === 0) {
         return {
           content: [{
             type: "text",
-            text: JSON.stringify({
-              error: "No valid models specified",
-              available_models: availableModelIds
-            }, null, 2)
+            text: JSON.stringify(await noValidModelsError(), null, 2)
           }]
         };
       }
-      
-      const results: Record<string, any> = {};
-      const totalModels = validModels.length;
-      
-      for (let idx = 0; idx < validModels.length; idx++) {
-        const modelName = validModels[idx];
-        
-        try {
-          const response = await callGitHubModelsAPI(
-            modelName,
-            [
-              { role: "system", content: system_message },
-              { role: "user", content: prompt }
-            ],
-            temperature,
-            top_p,
-            max_tokens
-          );
-          
-          results[modelName] = {
-            content: response.choices[0].message.content,
-            finish_reason: response.choices[0].finish_reason,
-            usage: response.usage
-          };
-        } catch (error) {
-          results[modelName] = { error: String(error) };
+
+      const limit = Math.max(1, Math.floor(concurrency));
+      const batchResults: Record<string, any>[] = new Array(prompts.length);
+      let next = 0;
+
+      // Worker pool: run up to `limit` prompts at a time so a large
+      // batch is not fully serialized but also cannot flood the API
+      const workers = Array.from({ length: Math.min(limit, prompts.length) }, async () => {
+        while (next < prompts.length) {
+          const idx = next++;
+          batchResults[idx] = await runValidatedComparison(
+            prompts[idx], system_message, validModels, temperature, top_p, max_tokens);
         }
-      }
-      
+      });
+      await Promise.all(workers);
+
       return {
         content: [{
           type: "text",
           text: JSON.stringify({
-            results,
+            results: batchResults,
             summary: {
-              models_compared: validModels,
-              prompt,
+              prompt_count: prompts.length,
+              concurrency: limit,
               system_message
             }
           }, null, 2)
@@ -191,4 +293,43 @@ export function registerTools(server: McpServer) {
       };
     }
   );
+
+  /**
+   * MCP Tool to persist comparison results to a JSON file
+   */
+  server.tool(
+    "save_comparison_results",
+    "Save model comparison results to a JSON file",
+    {
+      results: z.record(z.any()).describe("Comparison results to save (e.g. the output of compare_models or batch_compare)"),
+      output_path: z.string().describe("Path of the JSON file to write")
+    },
+    async ({ results, output_path }) => {
+      try {
+        // Asynchronous write keeps the event loop free for other tool
+        // calls while the results hit the disk
+        await writeFile(output_path, JSON.stringify(results, null, 2), "utf-8");
+
+        return {
+          content: [{
+            type: "text",
+            text: JSON.stringify({
+              saved: true,
+              output_path
+            }, null, 2)
+          }]
+        };
+      } catch (error) {
+        return {
+          content: [{
+            type: "text",
+            text: JSON.stringify({
+              saved: false,
+              error: String(error)
+            }, null, 2)
+          }]
+        };
+      }
+    }
+  );
 } 
\ No newline at end of file
@@ -36,4 +36,13 @@ export interface ModelData {
 export interface ModelsCache {
   data: ModelData[] | null;
   timestamp: number;
+}
+
+// Derived lookup structures, built once per cache refresh
+export interface ModelsIndex {
+  models: ModelData[];
+  byId: Map<string, ModelData>;
+  byPublisher: Map<string, ModelData[]>;
+  byPublisherLower: Map<string, ModelData[]>;
+  publishers: string[];
 } 
\ No newline at end of file
@@ -1,11 +1,43 @@
 from mcp.server.fastmcp import FastMCP
-import re
 from collections import Counter
 from typing import Dict, Optional
 
+import numpy as np
+
 # Create an MCP server
 mcp = FastMCP("Text Assist")
 
+# Texts shorter than this stay on Counter; numpy's setup cost
+# outweighs the faster scan below it
+NUMPY_FREQ_THRESHOLD = 4096
+
+def character_frequency(text: str) -> Dict[str, int]:
+    """
+    Build a character frequency table for already-lowercased text.
+
+    Small inputs use collections.Counter; larger inputs view the string
+    as UTF-32 codepoints and count with numpy.bincount, which scans at
+    C speed instead of one Python-level iteration per character.
+
+    Args:
+        text: The (lowercased) text to count characters in
+
+    Returns:
+        A dictionary mapping each character to its number of occurrences
+    """
+    if len(text) < NUMPY_FREQ_THRESHOLD:
+        return dict(Counter(text))
+
+    if text.isascii():
+        # ASCII fits a fixed 128-slot count array, and counting the raw
+        # bytes skips the 4x buffer expansion of the UTF-32 path
+        codepoints = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+        counts = np.bincount(codepoints, minlength=128)
+    else:
+        codepoints = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+        counts = np.bincount(codepoints)
+    return {chr(int(cp)): int(counts[cp]) for cp in np.nonzero(counts)[0]}
+
 @mcp.tool()
 def count_total_characters(text: str) -> int:
     """
@@ -30,7 +62,8 @@ def count_characters_without_spaces(text: str) -> int:
     Returns:
         The number of characters excluding spaces
     """
-    return len(text.replace(" ", ""))
+    # Counting spaces avoids allocating the spaceless copy replace() builds
+    return len(text) - text.count(" ")
 
 @mcp.tool()
 def count_words(text: str) -> int:
@@ -43,9 +76,9 @@ def count_words(text: str) -> int:
     Returns:
         The number of words in the text
     """
-    # Split by whitespace and filter out empty strings
-    words = [word for word in re.split(r'\s+', text) if word]
-    return len(words)
+    # str.split() with no argument splits on runs of whitespace and
+    # drops empty strings in C, without any regex overhead
+    return len(text.split())
 
 @mcp.tool()
 def count_specific_letters(text: str, letters: str) -> Dict[str, int]:
@@ -61,13 +94,16 @@ def count_specific_letters(text: str, letters: str) -> Dict[str, int]:
     """
     # Convert text to lowercase for case-insensitive counting
     text_lower = text.lower()
-    
-    # Create a counter for the specified letters
-    result = {}
-    for letter in letters.lower():
-        result[letter] = text_lower.count(letter)
-    
-    return result
+    letters_lower = letters.lower()
+
+    # One or two letters: direct scans beat Counter's setup cost
+    if len(set(letters_lower)) <= 2:
+        return {letter: text_lower.count(letter) for letter in letters_lower}
+
+    # Otherwise count every character in a single pass and answer each
+    # requested letter with an O(1) lookup instead of a full scan per letter
+    counts = Counter(text_lower)
+    return {letter: counts.get(letter, 0) for letter in letters_lower}
 
 @mcp.tool()
 def full_text_analysis(text: str) -> Dict[str, any]:
@@ -80,17 +116,16 @@ def full_text_analysis(text: str) -> Dict[str, any]:
     Returns:
         A dictionary containing various text statistics
     """
-    # Get character counts
-    total_chars = count_total_characters(text)
-    chars_no_spaces = count_characters_without_spaces(text)
-    word_count = count_words(text)
-    
+    # Get character counts in single C-level passes over the string,
+    # avoiding the copy that text.replace(" ", "") would allocate
+    total_chars = len(text)
+    spaces = text.count(" ")
+    chars_no_spaces = total_chars - spaces
+    word_count = len(text.split())
+
     # Get character frequency distribution
-    char_freq = dict(Counter(text.lower()))
-    
-    # Calculate additional statistics
-    spaces = total_chars - chars_no_spaces
-    
+    char_freq = character_frequency(text.lower())
+
     return {
         "total_characters": total_chars,
         "characters_without_spaces": chars_no_spaces,